@@ -2,6 +2,7 @@ from pathlib import Path
 import os
 from datetime import timedelta
 from urllib.parse import urlparse
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -77,6 +78,12 @@ CORS_ALLOWED_ORIGINS = [
     "https://frontend-shop-henna.vercel.app"
 ]
 
+CORS_ALLOW_HEADERS = (
+    *default_headers,
+    "idempotency-key",
+)
+CORS_EXPOSE_HEADERS = ["idempotent-replayed"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -111,6 +118,10 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Retried sale POSTs carrying the same Idempotency-Key replay the stored response
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+IDEMPOTENCY_CACHE_SIZE = 1024
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
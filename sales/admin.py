@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Shop, Sale, UserProfile
+from .models import Shop, Sale, UserProfile, IdempotencyKey
 
 admin.site.register(Shop)
 admin.site.register(UserProfile)
 admin.site.register(Sale)
+admin.site.register(IdempotencyKey)
@@ -0,0 +1,142 @@
+# idempotency.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+STORED_HEADERS = ('Location',)
+PURGE_BATCH_SIZE = 500
+
+
+class ResponseLRU:
+    """Small in-process cache of stored key records, checked before the key table."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                return None
+            if record.expires_at <= timezone.now():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return record
+
+    def set(self, key, record):
+        with self._lock:
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseLRU(getattr(settings, 'IDEMPOTENCY_CACHE_SIZE', 1024))
+
+
+def get_key_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', timedelta(hours=24))
+
+
+def scoped_key(request, raw_key):
+    # Scope the client key to the caller and endpoint so keys can't collide across them
+    user_id = request.user.pk if request.user.is_authenticated else ''
+    raw = f"{user_id}:{request.method}:{request.path}:{raw_key}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _fingerprint_value(value):
+    # Uploaded files are fingerprinted by name and size rather than read back
+    if hasattr(value, 'read'):
+        return [getattr(value, 'name', ''), getattr(value, 'size', None)]
+    return str(value)
+
+
+def request_fingerprint(request):
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    raw = json.dumps(data, sort_keys=True, default=_fingerprint_value)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def purge_expired_keys(limit=PURGE_BATCH_SIZE):
+    expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).values_list('pk', flat=True)[:limit]
+    IdempotencyKey.objects.filter(pk__in=list(expired)).delete()
+
+
+def replay_response(record, fingerprint):
+    if record.request_hash != fingerprint:
+        return Response(
+            {'detail': f"{IDEMPOTENCY_HEADER} was already used with a different request body."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    headers = {**record.response_headers, REPLAYED_HEADER: 'true'}
+    return Response(record.response_body, status=record.status_code, headers=headers)
+
+
+class IdempotentCreateMixin:
+    """
+    Replays the stored response for POSTs that repeat an Idempotency-Key header.
+    Concurrent duplicates block on the key row, so only one of them creates anything.
+    """
+
+    def create(self, request, *args, **kwargs):
+        raw_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not raw_key:
+            return super().create(request, *args, **kwargs)
+
+        key = scoped_key(request, raw_key)
+        fingerprint = request_fingerprint(request)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return replay_response(cached, fingerprint)
+
+        now = timezone.now()
+        with transaction.atomic():
+            record, created = IdempotencyKey.objects.select_for_update().get_or_create(
+                key=key,
+                defaults={'expires_at': now + get_key_ttl()},
+            )
+            if not created:
+                if record.status_code is not None and record.expires_at > now:
+                    response_cache.set(key, record)
+                    return replay_response(record, fingerprint)
+                record.expires_at = now + get_key_ttl()
+
+            # Errors raised here roll back the key row too, so a failed request can be retried
+            response = super().create(request, *args, **kwargs)
+            record.request_hash = fingerprint
+            record.status_code = response.status_code
+            record.response_body = response.data
+            record.response_headers = {
+                header: response[header] for header in STORED_HEADERS if response.has_header(header)
+            }
+            record.save()
+
+            transaction.on_commit(lambda: response_cache.set(key, record))
+            if created:
+                # Evict outside the request transaction so unrelated writes don't queue on expired rows
+                transaction.on_commit(purge_expired_keys)
+
+        return response
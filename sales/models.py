@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 class Shop(models.Model):
     SHOP_CHOICES = [
@@ -36,4 +37,15 @@ class Sale(models.Model):
     image = models.ImageField(upload_to='sales_images/', null=True, blank=True)
 
     def __str__(self):
-        return f"{self.shop} - {self.date} - KSH {self.closing_balance}"
\ No newline at end of file
+        return f"{self.shop} - {self.date} - KSH {self.closing_balance}"
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    request_hash = models.CharField(max_length=64, blank=True)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    response_headers = models.JSONField(default=dict, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.key
@@ -1,3 +1,103 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .idempotency import response_cache
+from .models import IdempotencyKey, Sale, Shop
+
+
+class IdempotentSaleCreateTests(APITestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.addCleanup(response_cache.clear)
+        self.shop = Shop.objects.create(name='cyber', location='Nairobi')
+        self.payload = {'shop': self.shop.id, 'date': '2024-08-08', 'cash_in': '100.00'}
+
+    def post(self, url='/sales/', data=None, key='abc-123', **kwargs):
+        if key is not None:
+            kwargs['HTTP_IDEMPOTENCY_KEY'] = key
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, data or self.payload, format='json', **kwargs)
+
+    def test_post_without_key_creates_sale(self):
+        response = self.post(key=None)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Sale.objects.count(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_retry_with_same_key_replays_response(self):
+        first = self.post()
+        second = self.post()
+
+        self.assertEqual(Sale.objects.count(), 1)
+        self.assertEqual(second.status_code, first.status_code)
+        self.assertEqual(second.data, first.data)
+        self.assertFalse(first.has_header('Idempotent-Replayed'))
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_retry_replays_from_key_table_when_not_cached(self):
+        first = self.post()
+        response_cache.clear()
+        second = self.post()
+
+        self.assertEqual(Sale.objects.count(), 1)
+        self.assertEqual(second.status_code, first.status_code)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_reused_key_with_different_body_is_rejected(self):
+        self.post()
+        response = self.post(data={**self.payload, 'cash_in': '999.00'})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Sale.objects.count(), 1)
+
+    def test_failed_post_leaves_no_key_so_retry_succeeds(self):
+        failed = self.post(data={'cash_in': '100.00'})
+
+        self.assertEqual(failed.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        retry = self.post()
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Sale.objects.count(), 1)
+
+    def test_expired_key_creates_new_sale(self):
+        self.post()
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch('sales.idempotency.timezone.now', return_value=later):
+            response = self.post()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+        self.assertEqual(Sale.objects.count(), 2)
+        self.assertGreater(IdempotencyKey.objects.get().expires_at, later)
+
+    def test_new_key_purges_expired_keys(self):
+        IdempotencyKey.objects.create(key='stale', expires_at=timezone.now() - timedelta(minutes=1))
+
+        self.post()
+
+        self.assertFalse(IdempotencyKey.objects.filter(key='stale').exists())
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_same_key_on_different_endpoints_does_not_collide(self):
+        self.post('/sales/')
+        self.post('/sales-list/')
+
+        self.assertEqual(Sale.objects.count(), 2)
+        self.assertEqual(IdempotencyKey.objects.count(), 2)
+
+    def test_same_key_from_different_users_does_not_collide(self):
+        for username in ('alice', 'bob'):
+            self.client.force_authenticate(User.objects.create_user(username=username, password='pass'))
+            response = self.post()
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(Sale.objects.count(), 2)
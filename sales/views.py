@@ -8,6 +8,7 @@ from .models import Sale, Shop, UserProfile
 from .serializers import SaleSerializer, ShopSerializer, UserProfileSerializer, UserSerializer
 from django.db.models import Sum
 from rest_framework_simplejwt.tokens import RefreshToken
+from .idempotency import IdempotentCreateMixin
 
 class ShopViewSet(viewsets.ModelViewSet):
     queryset = Shop.objects.all()
@@ -32,7 +33,7 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
     # Removed authentication_classes and permission_classes
 
-class SaleViewSet(viewsets.ModelViewSet):
+class SaleViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
     queryset = Sale.objects.all()
     serializer_class = SaleSerializer
     permission_classes = [AllowAny]  # Ensures that no authentication is required
@@ -73,7 +74,7 @@ class RegisterView(generics.CreateAPIView):
             'user': serializer.data
         }, status=status.HTTP_201_CREATED, headers=headers)
 
-class SaleListView(generics.ListCreateAPIView):
+class SaleListView(IdempotentCreateMixin, generics.ListCreateAPIView):
     queryset = Sale.objects.all()
     serializer_class = SaleSerializer
     permission_classes = [AllowAny]  # Ensures that no authentication is required